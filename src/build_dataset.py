@@ -6,16 +6,36 @@ the final JSONL dataset for training.
 """
 
 import json
+from collections import Counter
 from pathlib import Path
 from typing import List, Tuple
-from dataset_builder import build_normalized_dataset
-from synthetic_text_gen import generate_texts_for_rules
+from dataset_builder import iter_normalized_rules
+from synthetic_text_gen import iter_texts_for_rules
+
+# orjson is optional; fall back to the stdlib encoder when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Output file buffer size and the size at which accumulated JSONL lines are
+# handed to the file in one write
+WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+WRITE_CHUNK_SIZE = 1024 * 1024
+
+
+def dumps_jsonl_line(data: dict) -> bytes:
+    """Serialize one JSONL record (including the trailing newline) as UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(data) + b'\n'
+    return (json.dumps(data, separators=(',', ':'), ensure_ascii=False) + '\n').encode('utf-8')
 
 
 def build_jsonl_dataset(
     properties_path: str = "./data/construction_properties.json",
     sets_path: str = "./data/construction_sets.json",
-    output_path: str = "./dataset/construction_ashrae_2013.jsonl"
+    output_path: str = "./dataset/construction_ashrae_2013.jsonl",
+    num_workers: int = 1
 ) -> None:
     """
     Build the final JSONL dataset from normalized rules and synthetic texts.
@@ -24,72 +44,89 @@ def build_jsonl_dataset(
         properties_path: Path to construction_properties.json
         sets_path: Path to construction_sets.json
         output_path: Path to output JSONL file
+        num_workers: Number of processes generating synthetic texts (1 runs serially)
     """
     print("="*80)
     print("BUILDING DATASET")
     print("="*80)
     
-    # Step 1: Normalize rules
-    print("\nStep 1: Normalizing rules...")
-    rules = build_normalized_dataset(properties_path, sets_path)
-    print(f"Normalized {len(rules)} rules")
-    
-    # Step 2: Generate synthetic texts
-    print("\nStep 2: Generating synthetic texts...")
-    text_json_pairs = generate_texts_for_rules(rules)
-    print(f"Generated {len(text_json_pairs)} text-JSON pairs")
-    
-    # Step 3: Create output directory if it doesn't exist
+    # Create output directory if it doesn't exist
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
     
-    # Step 4: Write JSONL file
-    print(f"\nStep 3: Writing JSONL dataset to {output_path}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        for input_text, target_json in text_json_pairs:
-            # Each line is a JSON object with input_text and target_json
-            line_data = {
-                "input_text": input_text,
-                "target_json": target_json
-            }
-            f.write(json.dumps(line_data, ensure_ascii=False) + '\n')
+    # Normalize each rule, generate its synthetic texts and write them in a
+    # single pass, so neither the rules nor the text-JSON pairs are held in memory
+    print(f"\nNormalizing rules, generating synthetic texts and writing JSONL dataset to {output_path}...")
+    rule_count = 0
+    example_count = 0
+    category_counts = Counter()
+    first_examples = []  # (input_text, rule) for the first 3 examples written
+    
+    with open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        pending = bytearray()
+        rules = iter_normalized_rules(properties_path, sets_path)
+        for rule, text_json_pairs in iter_texts_for_rules(rules, num_workers=num_workers):
+            rule_count += 1
+            category_counts[rule.get("rule_category")] += 1
+            
+            for input_text, target_json in text_json_pairs:
+                # Each line is a JSON object with input_text and target_json
+                line_data = {
+                    "input_text": input_text,
+                    "target_json": target_json
+                }
+                pending += dumps_jsonl_line(line_data)
+                example_count += 1
+                if len(first_examples) < 3:
+                    first_examples.append((input_text, rule))
+            
+            if len(pending) >= WRITE_CHUNK_SIZE:
+                f.write(pending)
+                pending.clear()
+        
+        f.write(pending)
+    
+    print(f"Normalized {rule_count} rules")
+    print(f"Generated {example_count} text-JSON pairs")
     
     print(f"\n[OK] Dataset saved to {output_path}")
-    print(f"Total examples: {len(text_json_pairs)}")
-    print(f"Average examples per rule: {len(text_json_pairs) / len(rules):.2f}")
+    print(f"Total examples: {example_count}")
+    print(f"Average examples per rule: {example_count / rule_count:.2f}")
     
     # Print some statistics
     print("\n" + "="*80)
     print("DATASET STATISTICS")
     print("="*80)
     
-    # Count by rule category
-    performance_count = sum(1 for r in rules if r.get("rule_category") == "performance")
-    assignment_count = sum(1 for r in rules if r.get("rule_category") == "assignment")
-    
-    print(f"Performance rules: {performance_count}")
-    print(f"Assignment rules: {assignment_count}")
-    print(f"Total rules: {len(rules)}")
-    print(f"Total training examples: {len(text_json_pairs)}")
+    print(f"Performance rules: {category_counts['performance']}")
+    print(f"Assignment rules: {category_counts['assignment']}")
+    print(f"Total rules: {rule_count}")
+    print(f"Total training examples: {example_count}")
     
     # Show first few examples
     print("\n" + "="*80)
     print("FIRST 3 EXAMPLES FROM DATASET")
     print("="*80)
     
-    with open(output_file, 'r', encoding='utf-8') as f:
-        for i, line in enumerate(f):
-            if i >= 3:
-                break
-            example = json.loads(line)
-            print(f"\n--- Example {i+1} ---")
-            print(f"Input: {example['input_text']}")
-            target_json = json.loads(example['target_json'])
-            print(f"Target (rule_id): {target_json.get('rule_id', 'N/A')}")
-            print(f"Target (category): {target_json.get('rule_category', 'N/A')}")
+    for i, (input_text, rule) in enumerate(first_examples, 1):
+        print(f"\n--- Example {i} ---")
+        print(f"Input: {input_text}")
+        print(f"Target (rule_id): {rule.get('rule_id', 'N/A')}")
+        print(f"Target (category): {rule.get('rule_category', 'N/A')}")
 
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Build the JSONL training dataset")
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=1,
+        help="Number of processes generating synthetic texts (default: 1)"
+    )
+    args = parser.parse_args()
+    
     # Get the project root directory
     project_root = Path(__file__).parent.parent
     
@@ -101,6 +138,7 @@ if __name__ == "__main__":
     build_jsonl_dataset(
         str(properties_path),
         str(sets_path),
-        str(output_path)
+        str(output_path),
+        num_workers=args.num_workers
     )
 
@@ -6,17 +6,186 @@ into a unified JSON schema for fine-tuning a text-to-JSON model.
 """
 
 import json
+import os
+import sys
 import uuid
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Iterator, Optional
 from pathlib import Path
 
+# ijson is optional; without it entries are read with a full json.load
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# orjson is optional; without it files are parsed with the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Prefix of climate_zone_set values in construction_properties.json
+CLIMATE_ZONE_PREFIX = "ClimateZone "
+CLIMATE_ZONE_PREFIX_LENGTH = len(CLIMATE_ZONE_PREFIX)
+
+# Fields in construction_sets.json that represent surface type assignments,
+# mapped to the surface type they assign
+SURFACE_FIELD_TO_TYPE = {
+    "exterior_wall_standards_construction_type": "ExteriorWall",
+    "exterior_floor_standards_construction_type": "ExteriorFloor",
+    "exterior_roof_standards_construction_type": "ExteriorRoof",
+    "ground_contact_wall_standards_construction_type": "GroundContactWall",
+    "ground_contact_floor_standards_construction_type": "GroundContactFloor",
+    "ground_contact_ceiling_standards_construction_type": "GroundContactCeiling",
+    "exterior_fixed_window_standards_construction_type": "ExteriorFixedWindow",
+    "exterior_operable_window_standards_construction_type": "ExteriorOperableWindow",
+    "exterior_door_standards_construction_type": "ExteriorDoor",
+    "exterior_glass_door_standards_construction_type": "ExteriorGlassDoor",
+    "exterior_overhead_door_standards_construction_type": "ExteriorOverheadDoor",
+    "exterior_skylight_standards_construction_type": "ExteriorSkylight"
+}
+
+# Each surface field's corresponding building_category field
+# (e.g., "exterior_wall_standards_construction_type" -> "exterior_wall_building_category")
+SURFACE_FIELD_TO_CATEGORY_FIELD = {
+    surface_field: surface_field.replace("_standards_construction_type", "_building_category")
+    for surface_field in SURFACE_FIELD_TO_TYPE
+}
+
+
+# (schema field, construction_properties field) pairs for performance rules,
+# in schema order. A None source means the field is always null.
+PERFORMANCE_INPUT_FIELDS = (
+    ("building_type", None),
+    ("space_type", None),
+    ("surface_type", "intended_surface_type"),
+    ("construction_type", "standards_construction_type"),
+    ("building_category", "building_category"),
+    ("minimum_percent_of_surface", "minimum_percent_of_surface"),
+    ("maximum_percent_of_surface", "maximum_percent_of_surface")
+)
+
+PERFORMANCE_OUTPUT_FIELDS = (
+    ("construction_name", "construction"),
+    ("assigned_construction_type", None),
+    ("max_u_value", "assembly_maximum_u_value"),
+    ("max_f_factor", "assembly_maximum_f_factor"),
+    ("max_c_factor", "assembly_maximum_c_factor"),
+    ("max_shgc", "assembly_maximum_solar_heat_gain_coefficient"),
+    ("min_vt", "assembly_minimum_visible_transmittance"),
+    ("min_vt_shgc", "assembly_minimum_vt_shgc")
+)
+
+PERFORMANCE_UNIT_FIELDS = (
+    ("u_value", "assembly_maximum_u_value_unit"),
+    ("f_factor", "assembly_maximum_f_factor_unit"),
+    ("c_factor", "assembly_maximum_c_factor_unit"),
+    ("shgc", None),  # SHGC is unitless
+    ("vt", None)  # VT is unitless
+)
+
+PERFORMANCE_NOTE_FIELDS = (
+    ("u_value_includes_interior_film", "u_value_includes_interior_film_coefficient"),
+    ("u_value_includes_exterior_film", "u_value_includes_exterior_film_coefficient")
+)
+
+
+# Skeleton of an assignment rule; only the fields that vary per rule are
+# filled in by normalize_assignment_rule
+ASSIGNMENT_RULE_TEMPLATE = {
+    "standard": "ASHRAE 90.1-2013",
+    "domain": "Construction",
+    "rule_category": "assignment",
+    
+    "inputs": {
+        "climate_zone": None,
+        "building_type": None,
+        "space_type": None,
+        "surface_type": None,
+        "construction_type": None,
+        "building_category": None,
+        "minimum_percent_of_surface": None,
+        "maximum_percent_of_surface": None
+    },
+    
+    "outputs": {
+        "construction_name": None,
+        "assigned_construction_type": None,
+        "max_u_value": None,
+        "max_f_factor": None,
+        "max_c_factor": None,
+        "max_shgc": None,
+        "min_vt": None,
+        "min_vt_shgc": None
+    },
+    
+    "units": {
+        "u_value": None,
+        "f_factor": None,
+        "c_factor": None,
+        "shgc": None,
+        "vt": None
+    },
+    
+    "notes": {
+        "u_value_includes_interior_film": None,
+        "u_value_includes_exterior_film": None
+    }
+}
+
 
 def load_json_file(file_path: str) -> Dict[str, Any]:
     """Load and parse a JSON file."""
+    if orjson is not None:
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
     with open(file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
+def iter_json_entries(file_path: str, root_key: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the entries of the top-level list root_key in a JSON file.
+    
+    With ijson installed the file is parsed incrementally, so only one
+    entry is held in memory at a time.
+    """
+    if ijson is None:
+        yield from load_json_file(file_path).get(root_key, [])
+        return
+    
+    with open(file_path, 'rb') as f:
+        yield from ijson.items(f, f"{root_key}.item", use_float=True)
+
+
+def intern_string(value: Any) -> Any:
+    """
+    Intern string values read from the source JSON.
+    
+    Surface types, construction types, categories and units repeat across
+    thousands of entries; interning makes every rule share one string object
+    per distinct value instead of one per occurrence. Other values are
+    returned unchanged.
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def iter_rule_ids(batch_size: int = 1024) -> Iterator[str]:
+    """
+    Yield random (version 4) UUID strings for rule_id fields.
+    
+    Random bytes are read from os.urandom in batches of batch_size ids
+    instead of one system call per uuid.uuid4() call.
+    """
+    while True:
+        random_bytes = os.urandom(16 * batch_size)
+        for offset in range(0, len(random_bytes), 16):
+            yield str(uuid.UUID(bytes=random_bytes[offset:offset + 16], version=4))
+
+
 def extract_climate_zone(climate_zone_set: Optional[str]) -> Optional[str]:
     """
     Extract climate zone from climate_zone_set string.
@@ -24,61 +193,41 @@ def extract_climate_zone(climate_zone_set: Optional[str]) -> Optional[str]:
     """
     if climate_zone_set is None:
         return None
-    # Remove "ClimateZone " prefix if present
-    if climate_zone_set.startswith("ClimateZone "):
-        return climate_zone_set.replace("ClimateZone ", "").strip()
-    return climate_zone_set.strip()
+    # Slice off the "ClimateZone " prefix if present
+    if climate_zone_set.startswith(CLIMATE_ZONE_PREFIX):
+        climate_zone_set = climate_zone_set[CLIMATE_ZONE_PREFIX_LENGTH:]
+    return intern_string(climate_zone_set.strip())
 
 
-def normalize_performance_rule(entry: Dict[str, Any]) -> Dict[str, Any]:
+def normalize_performance_rule(
+    entry: Dict[str, Any],
+    rule_id: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Normalize a construction_properties entry into the unified schema.
     rule_category = "performance"
+    
+    Args:
+        entry: The construction_properties entry
+        rule_id: Optional rule_id to use (a new UUID is generated if omitted)
     """
     # Extract climate zone
     climate_zone = extract_climate_zone(entry.get("climate_zone_set"))
     
     # Build the normalized rule
     rule = {
-        "rule_id": str(uuid.uuid4()),
+        "rule_id": rule_id if rule_id is not None else str(uuid.uuid4()),
         "standard": "ASHRAE 90.1-2013",
         "domain": "Construction",
         "rule_category": "performance",
         
         "inputs": {
             "climate_zone": climate_zone,
-            "building_type": None,
-            "space_type": None,
-            "surface_type": entry.get("intended_surface_type"),
-            "construction_type": entry.get("standards_construction_type"),
-            "building_category": entry.get("building_category"),
-            "minimum_percent_of_surface": entry.get("minimum_percent_of_surface"),
-            "maximum_percent_of_surface": entry.get("maximum_percent_of_surface")
+            **{field: intern_string(entry.get(source)) if source else None for field, source in PERFORMANCE_INPUT_FIELDS}
         },
-        
-        "outputs": {
-            "construction_name": entry.get("construction"),
-            "assigned_construction_type": None,
-            "max_u_value": entry.get("assembly_maximum_u_value"),
-            "max_f_factor": entry.get("assembly_maximum_f_factor"),
-            "max_c_factor": entry.get("assembly_maximum_c_factor"),
-            "max_shgc": entry.get("assembly_maximum_solar_heat_gain_coefficient"),
-            "min_vt": entry.get("assembly_minimum_visible_transmittance"),
-            "min_vt_shgc": entry.get("assembly_minimum_vt_shgc")
-        },
-        
-        "units": {
-            "u_value": entry.get("assembly_maximum_u_value_unit"),
-            "f_factor": entry.get("assembly_maximum_f_factor_unit"),
-            "c_factor": entry.get("assembly_maximum_c_factor_unit"),
-            "shgc": None,  # SHGC is unitless
-            "vt": None  # VT is unitless
-        },
-        
-        "notes": {
-            "u_value_includes_interior_film": entry.get("u_value_includes_interior_film_coefficient"),
-            "u_value_includes_exterior_film": entry.get("u_value_includes_exterior_film_coefficient")
-        }
+        "outputs": {field: intern_string(entry.get(source)) if source else None for field, source in PERFORMANCE_OUTPUT_FIELDS},
+        "units": {field: intern_string(entry.get(source)) if source else None for field, source in PERFORMANCE_UNIT_FIELDS},
+        "notes": {field: entry.get(source) if source else None for field, source in PERFORMANCE_NOTE_FIELDS}
     }
     
     return rule
@@ -88,7 +237,8 @@ def normalize_assignment_rule(
     construction_set: Dict[str, Any],
     surface_field: str,
     construction_type: str,
-    building_category: Optional[str]
+    building_category: Optional[str],
+    rule_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Normalize a construction_sets entry into an assignment rule.
@@ -99,81 +249,66 @@ def normalize_assignment_rule(
         surface_field: The field name (e.g., "exterior_wall_standards_construction_type")
         construction_type: The construction type value (non-null)
         building_category: The corresponding building category
+        rule_id: Optional rule_id to use (a new UUID is generated if omitted)
     """
     # Map surface field names to surface types
-    # Extract surface type from field name (e.g., "exterior_wall_..." -> "ExteriorWall")
-    surface_type = None
-    if "exterior_wall" in surface_field:
-        surface_type = "ExteriorWall"
-    elif "exterior_floor" in surface_field:
-        surface_type = "ExteriorFloor"
-    elif "exterior_roof" in surface_field:
-        surface_type = "ExteriorRoof"
-    elif "ground_contact_wall" in surface_field:
-        surface_type = "GroundContactWall"
-    elif "ground_contact_floor" in surface_field:
-        surface_type = "GroundContactFloor"
-    elif "ground_contact_ceiling" in surface_field:
-        surface_type = "GroundContactCeiling"
-    elif "exterior_fixed_window" in surface_field:
-        surface_type = "ExteriorFixedWindow"
-    elif "exterior_operable_window" in surface_field:
-        surface_type = "ExteriorOperableWindow"
-    elif "exterior_door" in surface_field:
-        surface_type = "ExteriorDoor"
-    elif "exterior_glass_door" in surface_field:
-        surface_type = "ExteriorGlassDoor"
-    elif "exterior_overhead_door" in surface_field:
-        surface_type = "ExteriorOverheadDoor"
-    elif "exterior_skylight" in surface_field:
-        surface_type = "ExteriorSkylight"
+    # (e.g., "exterior_wall_standards_construction_type" -> "ExteriorWall")
+    surface_type = SURFACE_FIELD_TO_TYPE.get(surface_field)
     
-    # Build the normalized rule
+    # "Any" building type means the rule is not building-type specific
+    building_type = intern_string(construction_set.get("building_type"))
+    if building_type == "Any":
+        building_type = None
+    
+    # Build the normalized rule from the template, copying each section so
+    # rules never share nested dicts
     rule = {
-        "rule_id": str(uuid.uuid4()),
-        "standard": "ASHRAE 90.1-2013",
-        "domain": "Construction",
-        "rule_category": "assignment",
-        
+        "rule_id": rule_id if rule_id is not None else str(uuid.uuid4()),
+        **ASSIGNMENT_RULE_TEMPLATE,
         "inputs": {
-            "climate_zone": None,
-            "building_type": construction_set.get("building_type") if construction_set.get("building_type") != "Any" else None,
-            "space_type": construction_set.get("space_type"),
+            **ASSIGNMENT_RULE_TEMPLATE["inputs"],
+            "building_type": building_type,
+            "space_type": intern_string(construction_set.get("space_type")),
             "surface_type": surface_type,
-            "construction_type": None,
-            "building_category": building_category,
-            "minimum_percent_of_surface": None,
-            "maximum_percent_of_surface": None
+            "building_category": building_category
         },
-        
         "outputs": {
-            "construction_name": None,
-            "assigned_construction_type": construction_type,
-            "max_u_value": None,
-            "max_f_factor": None,
-            "max_c_factor": None,
-            "max_shgc": None,
-            "min_vt": None,
-            "min_vt_shgc": None
+            **ASSIGNMENT_RULE_TEMPLATE["outputs"],
+            "assigned_construction_type": construction_type
         },
-        
-        "units": {
-            "u_value": None,
-            "f_factor": None,
-            "c_factor": None,
-            "shgc": None,
-            "vt": None
-        },
-        
-        "notes": {
-            "u_value_includes_interior_film": None,
-            "u_value_includes_exterior_film": None
-        }
+        "units": {**ASSIGNMENT_RULE_TEMPLATE["units"]},
+        "notes": {**ASSIGNMENT_RULE_TEMPLATE["notes"]}
     }
     
     return rule
 
 
+def is_valid_properties_entry(entry: Any) -> bool:
+    """Check that a construction_properties entry can be normalized."""
+    return isinstance(entry, dict) and isinstance(entry.get("climate_zone_set"), (str, type(None)))
+
+
+def is_valid_construction_set(construction_set: Any) -> bool:
+    """Check that a construction_sets entry can be normalized."""
+    return isinstance(construction_set, dict)
+
+
+def iter_performance_rules(
+    properties_list: Iterable[Dict[str, Any]]
+) -> Iterator[Dict[str, Any]]:
+    """
+    Normalize construction_properties entries one at a time.
+    Yields performance rules.
+    """
+    rule_ids = iter_rule_ids()
+    
+    for entry in properties_list:
+        if not is_valid_properties_entry(entry):
+            print(f"Warning: Skipping invalid construction_properties entry: {entry!r}")
+            continue
+        yield normalize_performance_rule(entry, next(rule_ids))
+
+
 def normalize_construction_properties(
     properties_data: Dict[str, Any]
 ) -> List[Dict[str, Any]]:
@@ -181,18 +316,38 @@ def normalize_construction_properties(
     Normalize all entries from construction_properties.json.
     Returns a list of performance rules.
     """
-    rules = []
-    properties_list = properties_data.get("construction_properties", [])
+    return list(iter_performance_rules(properties_data.get("construction_properties", [])))
+
+
+def iter_assignment_rules(
+    sets_list: Iterable[Dict[str, Any]]
+) -> Iterator[Dict[str, Any]]:
+    """
+    Normalize construction_sets entries one at a time.
+    Yields assignment rules (one per non-null surface type).
+    """
+    rule_ids = iter_rule_ids()
     
-    for entry in properties_list:
-        try:
-            rule = normalize_performance_rule(entry)
-            rules.append(rule)
-        except Exception as e:
-            print(f"Warning: Failed to normalize performance rule: {e}")
+    for construction_set in sets_list:
+        if not is_valid_construction_set(construction_set):
+            print(f"Warning: Skipping invalid construction_sets entry: {construction_set!r}")
             continue
-    
-    return rules
+        
+        for surface_field, building_category_field in SURFACE_FIELD_TO_CATEGORY_FIELD.items():
+            construction_type = intern_string(construction_set.get(surface_field))
+            
+            # Only create a rule if construction_type is not null
+            if construction_type is not None:
+                # Get the corresponding building_category
+                building_category = intern_string(construction_set.get(building_category_field))
+                
+                yield normalize_assignment_rule(
+                    construction_set,
+                    surface_field,
+                    construction_type,
+                    building_category,
+                    next(rule_ids)
+                )
 
 
 def normalize_construction_sets(
@@ -202,50 +357,27 @@ def normalize_construction_sets(
     Normalize all entries from construction_sets.json.
     Returns a list of assignment rules (one per non-null surface type).
     """
-    rules = []
-    sets_list = sets_data.get("construction_sets", [])
-    
-    # Fields that represent surface type assignments
-    surface_type_fields = [
-        "exterior_wall_standards_construction_type",
-        "exterior_floor_standards_construction_type",
-        "exterior_roof_standards_construction_type",
-        "ground_contact_wall_standards_construction_type",
-        "ground_contact_floor_standards_construction_type",
-        "ground_contact_ceiling_standards_construction_type",
-        "exterior_fixed_window_standards_construction_type",
-        "exterior_operable_window_standards_construction_type",
-        "exterior_door_standards_construction_type",
-        "exterior_glass_door_standards_construction_type",
-        "exterior_overhead_door_standards_construction_type",
-        "exterior_skylight_standards_construction_type"
-    ]
-    
-    for construction_set in sets_list:
-        for surface_field in surface_type_fields:
-            construction_type = construction_set.get(surface_field)
-            
-            # Only create a rule if construction_type is not null
-            if construction_type is not None:
-                # Get the corresponding building_category field
-                building_category_field = surface_field.replace(
-                    "_standards_construction_type", "_building_category"
-                )
-                building_category = construction_set.get(building_category_field)
-                
-                try:
-                    rule = normalize_assignment_rule(
-                        construction_set,
-                        surface_field,
-                        construction_type,
-                        building_category
-                    )
-                    rules.append(rule)
-                except Exception as e:
-                    print(f"Warning: Failed to normalize assignment rule for {surface_field}: {e}")
-                    continue
+    return list(iter_assignment_rules(sets_data.get("construction_sets", [])))
+
+
+def iter_normalized_rules(
+    properties_path: str = "./data/construction_properties.json",
+    sets_path: str = "./data/construction_sets.json"
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream normalized rules (performance, then assignment) without
+    materializing the full rule list.
     
-    return rules
+    Args:
+        properties_path: Path to construction_properties.json
+        sets_path: Path to construction_sets.json
+    """
+    yield from iter_performance_rules(
+        iter_json_entries(properties_path, "construction_properties")
+    )
+    yield from iter_assignment_rules(
+        iter_json_entries(sets_path, "construction_sets")
+    )
 
 
 def build_normalized_dataset(
@@ -262,21 +394,18 @@ def build_normalized_dataset(
     Returns:
         List of normalized rules (performance + assignment)
     """
-    # Load JSON files
-    print("Loading construction_properties.json...")
-    properties_data = load_json_file(properties_path)
-    
-    print("Loading construction_sets.json...")
-    sets_data = load_json_file(sets_path)
-    
-    # Normalize performance rules
-    print("Normalizing performance rules...")
-    performance_rules = normalize_construction_properties(properties_data)
+    # Load and normalize performance rules (entries are streamed from the file)
+    print("Loading and normalizing construction_properties.json...")
+    performance_rules = list(iter_performance_rules(
+        iter_json_entries(properties_path, "construction_properties")
+    ))
     print(f"Created {len(performance_rules)} performance rules")
     
-    # Normalize assignment rules
-    print("Normalizing assignment rules...")
-    assignment_rules = normalize_construction_sets(sets_data)
+    # Load and normalize assignment rules
+    print("Loading and normalizing construction_sets.json...")
+    assignment_rules = list(iter_assignment_rules(
+        iter_json_entries(sets_path, "construction_sets")
+    ))
     print(f"Created {len(assignment_rules)} assignment rules")
     
     # Combine rules
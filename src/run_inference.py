@@ -5,41 +5,270 @@ Loads a fine-tuned model and generates JSON from natural language descriptions.
 Includes auto-correction for invalid JSON output.
 """
 
+import functools
+import hashlib
+import importlib.util
 import json
 import re
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, List, Any, Optional
 import torch
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+from transformers import AutoConfig, AutoTokenizer, AutoModelForSeq2SeqLM, BitsAndBytesConfig
+from transformers.modeling_outputs import BaseModelOutput
+from transformers.models.auto.modeling_auto import MODEL_FOR_SEQ_TO_SEQ_CAUSAL_LM_MAPPING
 
+# CTranslate2 is optional; it is only needed for --backend ct2
+try:
+    import ctranslate2
+except ImportError:
+    ctranslate2 = None
 
-def load_model(model_path: str):
+# optimum's ONNX Runtime models are optional; only needed for --backend ort
+try:
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+except ImportError:
+    onnxruntime = None
+    ORTModelForSeq2SeqLM = None
+
+BACKENDS = ("hf", "ct2", "ort")
+QUANT_MODES = ("none", "int8", "int4")
+
+# Number of encoder outputs kept by the interactive mode's encoder cache
+ENCODER_CACHE_SIZE = 64
+
+# Tokens scanned by fix_json_string in one pass: double-quoted strings (group
+# 1, kept as is), single-quoted strings (group 2, requoted) and trailing commas
+# before a closing brace/bracket (dropped)
+JSON_FIX_PATTERN = re.compile(
+    r'("[^"\\]*(?:\\.[^"\\]*)*")'
+    r"|'([^'\\]*(?:\\.[^'\\]*)*)'"
+    r'|,(?=\s*[}\]])',
+    re.DOTALL
+)
+TRAILING_COMMA_PATTERN = re.compile(r',\s*[}\]]')
+# Bare double quotes and escapes inside a single-quoted string
+SINGLE_QUOTED_CONTENT_PATTERN = re.compile(r'\\(.)|"', re.DOTALL)
+
+# CTranslate2 compute type matching each inference dtype
+CT2_COMPUTE_TYPES = {
+    torch.float32: "float32",
+    torch.float16: "float16",
+    torch.bfloat16: "bfloat16"
+}
+
+
+def select_inference_dtype(device: str) -> torch.dtype:
+    """
+    Pick the weight dtype for inference on the given device.
+    
+    BF16 on GPUs with compute capability 8.0+ (Ampere and newer), FP16 on
+    older GPUs, and FP32 on CPU.
+    """
+    if device != "cuda":
+        return torch.float32
+    if torch.cuda.get_device_capability()[0] >= 8:
+        return torch.bfloat16
+    return torch.float16
+
+
+def build_quantization_config(quant: str, device: str, dtype: torch.dtype) -> Optional[BitsAndBytesConfig]:
+    """
+    Build the bitsandbytes weight-only quantization config for the hf backend.
+    
+    Returns None (unquantized weights in dtype) for quant "none", and with a
+    warning when bitsandbytes or a CUDA device is not available.
+    """
+    if quant == "none":
+        return None
+    if device != "cuda" or importlib.util.find_spec("bitsandbytes") is None:
+        print(f"[WARNING] {quant} quantization requires CUDA and bitsandbytes; loading {dtype} weights instead")
+        return None
+    
+    if quant == "int8":
+        return BitsAndBytesConfig(load_in_8bit=True)
+    return BitsAndBytesConfig(
+        load_in_4bit=True, bnb_4bit_quant_type="nf4", bnb_4bit_compute_dtype=dtype
+    )
+
+
+def supports_sdpa(model_path: str) -> bool:
+    """Whether the Transformers model class for model_path implements SDPA attention."""
+    config_class = type(AutoConfig.from_pretrained(model_path))
+    if config_class not in MODEL_FOR_SEQ_TO_SEQ_CAUSAL_LM_MAPPING:
+        return False
+    return bool(getattr(MODEL_FOR_SEQ_TO_SEQ_CAUSAL_LM_MAPPING[config_class], "_supports_sdpa", False))
+
+
+def load_hf_model(
+    model_path: str,
+    device: str,
+    dtype: torch.dtype,
+    compile_encoder: bool = False,
+    quant: str = "none"
+):
+    """
+    Load the fine-tuned model with HuggingFace Transformers.
+    
+    With compile_encoder, the encoder is wrapped in torch.compile; the first
+    generate call is slow while it compiles. With quant "int8" or "int4", the
+    linear layer weights are quantized by bitsandbytes at load time.
+    """
+    model_kwargs = {"torch_dtype": dtype}
+    quantization_config = build_quantization_config(quant, device, dtype)
+    if quantization_config is not None:
+        # bitsandbytes places the quantized weights itself
+        model_kwargs.update(quantization_config=quantization_config, device_map="auto")
+    
+    # Use PyTorch's fused scaled-dot-product attention where the model class
+    # implements it (T5 only does in recent Transformers releases)
+    if supports_sdpa(model_path):
+        model_kwargs["attn_implementation"] = "sdpa"
+    
+    # Load weights directly in the inference dtype to avoid an FP32 copy
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_path, **model_kwargs)
+    
+    model.config.use_cache = True
+    if quantization_config is None:
+        model.to(device)
+    model.eval()
+    
+    if compile_encoder:
+        model.encoder = torch.compile(model.encoder, mode="reduce-overhead", fullgraph=False)
+    return model
+
+
+def load_ct2_translator(model_path: str, device: str, dtype: torch.dtype, quant: str = "none"):
+    """
+    Load the fine-tuned model as a CTranslate2 translator.
+    
+    The model is converted once into a "ctranslate2" subdirectory of
+    model_path and reused on later runs. With quant "int8" the weights are
+    quantized to INT8 when loaded; CTranslate2 has no INT4 mode, so "int4"
+    also uses INT8.
+    """
+    if ctranslate2 is None:
+        raise ImportError("The ct2 backend requires ctranslate2 (pip install ctranslate2)")
+    
+    ct2_path = Path(model_path) / "ctranslate2"
+    if not ct2_path.exists():
+        print(f"Converting model to CTranslate2 format at {ct2_path}...")
+        ctranslate2.converters.TransformersConverter(model_path).convert(str(ct2_path))
+    
+    if quant == "none":
+        compute_type = CT2_COMPUTE_TYPES[dtype]
+    else:
+        if quant == "int4":
+            print("[WARNING] CTranslate2 does not support int4; using int8")
+        compute_type = "int8_float16" if device == "cuda" else "int8"
+    
+    return ctranslate2.Translator(str(ct2_path), device=device, compute_type=compute_type)
+
+
+def load_ort_model(model_path: str, device: str):
+    """
+    Load the fine-tuned model as an ONNX Runtime seq2seq model.
+    
+    The model is exported once into an "onnx" subdirectory of model_path
+    and reused on later runs. On GPU, inputs and outputs are bound to device
+    memory (IOBinding) to avoid host/device copies at every decoding step.
+    GPU inference needs the onnxruntime-gpu build; with the CPU-only build
+    the model runs on CPU.
+    """
+    if ORTModelForSeq2SeqLM is None:
+        raise ImportError("The ort backend requires optimum[onnxruntime] (pip install optimum[onnxruntime])")
+    
+    onnx_path = Path(model_path) / "onnx"
+    if not onnx_path.exists():
+        print(f"Exporting model to ONNX at {onnx_path}...")
+        ORTModelForSeq2SeqLM.from_pretrained(model_path, export=True).save_pretrained(onnx_path)
+    
+    if device == "cuda" and "CUDAExecutionProvider" not in onnxruntime.get_available_providers():
+        print("[WARNING] onnxruntime has no CUDA support (install optimum[onnxruntime-gpu]); running on CPU")
+        device = "cpu"
+    
+    if device == "cuda":
+        return ORTModelForSeq2SeqLM.from_pretrained(
+            onnx_path, provider="CUDAExecutionProvider", use_io_binding=True
+        )
+    return ORTModelForSeq2SeqLM.from_pretrained(onnx_path, provider="CPUExecutionProvider")
+
+
+@functools.lru_cache(maxsize=2)
+def load_model(model_path: str, backend: str = "hf", compile_encoder: bool = False, quant: str = "none"):
     """
     Load the fine-tuned model and tokenizer.
     
+    Results are cached per (model_path, backend, compile_encoder, quant), so
+    repeated calls in the same process reuse the already loaded model.
+    
     Args:
         model_path: Path to the fine-tuned model directory
+        backend: Generation backend ("hf" for Transformers, "ct2" for
+            CTranslate2, "ort" for ONNX Runtime)
+        compile_encoder: Whether to torch.compile the encoder (hf backend only)
+        quant: Weight quantization ("none", "int8" or "int4"; hf and ct2
+            backends only)
     
     Returns:
-        Tuple of (tokenizer, model)
+        Tuple of (tokenizer, model, device)
     """
-    print(f"Loading model from {model_path}...")
-    
-    tokenizer = AutoTokenizer.from_pretrained(model_path)
-    model = AutoModelForSeq2SeqLM.from_pretrained(model_path)
+    print(f"Loading model from {model_path} ({backend} backend)...")
     
     device = "cuda" if torch.cuda.is_available() else "cpu"
-    model.to(device)
-    model.eval()
+    dtype = select_inference_dtype(device)
     
-    print(f"Model loaded on {device}")
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    if backend == "ct2":
+        model = load_ct2_translator(model_path, device, dtype, quant=quant)
+        precision = model.compute_type
+    elif backend == "ort":
+        if quant != "none":
+            print(f"[WARNING] {quant} quantization is not supported by the ort backend; ignoring")
+        model = load_ort_model(model_path, device)
+        # load_ort_model falls back to CPU without the onnxruntime-gpu build
+        device = model.device.type
+        # The ONNX export keeps the FP32 weights
+        precision = "float32"
+    else:
+        model = load_hf_model(model_path, device, dtype, compile_encoder=compile_encoder, quant=quant)
+        precision = str(dtype)
+        if getattr(model, "is_quantized", False):
+            precision += f", {quant} weights"
+    
+    print(f"Model loaded on {device} ({precision})")
     return tokenizer, model, device
 
 
+def escape_single_quoted_char(match: "re.Match") -> str:
+    """Replacement for SINGLE_QUOTED_CONTENT_PATTERN matches."""
+    escaped = match.group(1)
+    if escaped is None:
+        # Bare double quote
+        return '\\"'
+    if escaped == "'":
+        # \' is not a valid JSON escape
+        return "'"
+    return match.group(0)
+
+
+def requote_json_token(match: "re.Match") -> str:
+    """Replacement for JSON_FIX_PATTERN matches."""
+    if match.group(2) is None:
+        return match.group(1) or ""
+    content = SINGLE_QUOTED_CONTENT_PATTERN.sub(escape_single_quoted_char, match.group(2))
+    return f'"{content}"'
+
+
 def fix_json_string(json_str: str) -> Optional[str]:
     """
     Attempt to fix common JSON formatting issues.
     
+    Strips markdown code fences and surrounding text, then makes a single
+    pass over the JSON that turns single-quoted strings into double-quoted
+    ones and drops trailing commas before closing braces/brackets.
+    
     Args:
         json_str: Potentially malformed JSON string
     
@@ -50,78 +279,36 @@ def fix_json_string(json_str: str) -> Optional[str]:
     json_str = json_str.strip()
     
     # Remove markdown code blocks if present
-    json_str = re.sub(r'^```json\s*', '', json_str, flags=re.IGNORECASE)
-    json_str = re.sub(r'^```\s*', '', json_str, flags=re.IGNORECASE)
-    json_str = re.sub(r'```\s*$', '', json_str, flags=re.IGNORECASE)
+    if json_str.startswith("```"):
+        json_str = json_str[3:]
+        if json_str[:4].lower() == "json":
+            json_str = json_str[4:]
+    if json_str.endswith("```"):
+        json_str = json_str[:-3]
+    json_str = json_str.strip()
     
     # Try to extract JSON if wrapped in text
-    json_match = re.search(r'\{.*\}', json_str, re.DOTALL)
-    if json_match:
-        json_str = json_match.group(0)
-    
-    # Fix common issues
-    # Replace single quotes with double quotes (simple cases)
-    json_str = re.sub(r"'([^']*)':", r'"\1":', json_str)
-    json_str = re.sub(r":\s*'([^']*)'", r': "\1"', json_str)
-    
-    # Fix trailing commas (remove before closing braces/brackets)
-    json_str = re.sub(r',\s*}', '}', json_str)
-    json_str = re.sub(r',\s*]', ']', json_str)
+    start = json_str.find("{")
+    end = json_str.rfind("}")
+    if start != -1 and end > start:
+        json_str = json_str[start:end + 1]
     
-    return json_str
+    # Skip the scan when there is nothing it could fix
+    if "'" not in json_str and TRAILING_COMMA_PATTERN.search(json_str) is None:
+        return json_str
+    return JSON_FIX_PATTERN.sub(requote_json_token, json_str)
 
 
-def generate_json(
-    text: str,
-    tokenizer,
-    model,
-    device: str,
-    max_input_length: int = 512,
-    max_output_length: int = 512,
-    num_beams: int = 4,
-    do_sample: bool = False,
-    temperature: float = 1.0
-) -> Dict[str, Any]:
+def parse_generated_json(generated_text: str) -> Dict[str, Any]:
     """
-    Generate JSON from natural language text.
+    Parse generated text as JSON, applying fix_json_string if needed.
     
     Args:
-        text: Input natural language description
-        tokenizer: Tokenizer instance
-        model: Model instance
-        device: Device to run inference on
-        max_input_length: Maximum input sequence length
-        max_output_length: Maximum output sequence length
-        num_beams: Number of beams for beam search
-        do_sample: Whether to use sampling
-        temperature: Temperature for sampling
+        generated_text: Decoded model output
     
     Returns:
-        Parsed JSON dictionary
+        Parsed JSON dictionary, or an error structure if parsing failed
     """
-    # Tokenize input
-    inputs = tokenizer(
-        text,
-        max_length=max_input_length,
-        padding=True,
-        truncation=True,
-        return_tensors="pt"
-    ).to(device)
-    
-    # Generate
-    with torch.no_grad():
-        outputs = model.generate(
-            **inputs,
-            max_length=max_output_length,
-            num_beams=num_beams,
-            do_sample=do_sample,
-            temperature=temperature,
-            early_stopping=True
-        )
-    
-    # Decode
-    generated_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
-    
     # Try to parse JSON
     try:
         result = json.loads(generated_text)
@@ -144,6 +331,269 @@ def generate_json(
         }
 
 
+def encoder_cache_key(input_ids: torch.Tensor) -> bytes:
+    """Hash a CPU input_ids tensor into an encoder_cache key."""
+    return hashlib.blake2b(input_ids.numpy().tobytes(), digest_size=16).digest()
+
+
+def encode_cached(
+    model,
+    inputs: Dict[str, torch.Tensor],
+    encoder_cache: OrderedDict,
+    key: bytes
+) -> BaseModelOutput:
+    """
+    Run the model's encoder, reusing the output for previously seen input_ids.
+    
+    encoder_cache maps encoder_cache_key(input_ids) to the encoder's last
+    hidden state and keeps the ENCODER_CACHE_SIZE most recently used entries.
+    """
+    hidden_state = encoder_cache.get(key)
+    if hidden_state is None:
+        hidden_state = model.get_encoder()(
+            input_ids=inputs["input_ids"], attention_mask=inputs["attention_mask"], return_dict=True
+        ).last_hidden_state
+        # Copy out of the encoder's output buffer: a torch.compile'd encoder
+        # using CUDA graphs overwrites it on the next run
+        hidden_state = hidden_state.clone()
+        encoder_cache[key] = hidden_state
+        if len(encoder_cache) > ENCODER_CACHE_SIZE:
+            encoder_cache.popitem(last=False)
+    else:
+        encoder_cache.move_to_end(key)
+    
+    # A fresh wrapper per call: generate expands it in place for beam search
+    return BaseModelOutput(last_hidden_state=hidden_state)
+
+
+def generate_texts_hf(
+    texts: List[str],
+    tokenizer,
+    model,
+    device: str,
+    max_input_length: int,
+    max_new_tokens: int,
+    num_beams: int,
+    do_sample: bool,
+    temperature: float,
+    encoder_cache: Optional[OrderedDict] = None
+) -> List[str]:
+    """
+    Generate raw output text for a batch with model.generate
+    (Transformers or ONNX Runtime models).
+    
+    With an encoder_cache (Transformers models only), the encoder pass is
+    skipped for inputs whose encoder output is already cached.
+    """
+    # Tokenize inputs (padded to the longest text in the batch; a single
+    # text needs no padding)
+    inputs = tokenizer(
+        texts,
+        max_length=max_input_length,
+        padding="longest" if len(texts) > 1 else False,
+        truncation=True,
+        return_tensors="pt"
+    )
+    # Hash on the host copy, before the (asynchronous) transfer to the device
+    cache_key = encoder_cache_key(inputs["input_ids"]) if encoder_cache is not None else None
+    if device == "cuda":
+        # Copy from pinned host memory so the transfer can run asynchronously
+        inputs = {name: tensor.pin_memory().to(device, non_blocking=True) for name, tensor in inputs.items()}
+    else:
+        inputs = inputs.to(device)
+    
+    generation_kwargs = {}
+    if num_beams > 1:
+        # Stop beam search as soon as num_beams finished candidates exist
+        generation_kwargs["early_stopping"] = True
+    
+    # Generate
+    with torch.inference_mode():
+        if encoder_cache is not None:
+            generation_kwargs["encoder_outputs"] = encode_cached(model, inputs, encoder_cache, cache_key)
+        outputs = model.generate(
+            **inputs,
+            max_new_tokens=max_new_tokens,
+            num_beams=num_beams,
+            do_sample=do_sample,
+            temperature=temperature,
+            **generation_kwargs
+        )
+    
+    # Decode
+    return tokenizer.batch_decode(outputs, skip_special_tokens=True)
+
+
+def generate_texts_ct2(
+    texts: List[str],
+    tokenizer,
+    translator,
+    max_input_length: int,
+    max_new_tokens: int,
+    num_beams: int,
+    do_sample: bool,
+    temperature: float
+) -> List[str]:
+    """Generate raw output text for a batch with a CTranslate2 translator."""
+    input_ids = tokenizer(texts, max_length=max_input_length, truncation=True)["input_ids"]
+    source_tokens = [tokenizer.convert_ids_to_tokens(ids) for ids in input_ids]
+    
+    results = translator.translate_batch(
+        source_tokens,
+        beam_size=1 if do_sample else num_beams,
+        max_decoding_length=max_new_tokens,
+        sampling_topk=0 if do_sample else 1,
+        sampling_temperature=temperature
+    )
+    
+    return [
+        tokenizer.decode(tokenizer.convert_tokens_to_ids(result.hypotheses[0]), skip_special_tokens=True)
+        for result in results
+    ]
+
+
+def generate_json_batch(
+    texts: List[str],
+    tokenizer,
+    model,
+    device: str,
+    max_input_length: int = 512,
+    max_new_tokens: int = 512,
+    num_beams: int = 1,
+    do_sample: bool = False,
+    temperature: float = 1.0,
+    encoder_cache: Optional[OrderedDict] = None
+) -> List[Dict[str, Any]]:
+    """
+    Generate JSON for a batch of natural language texts with a single
+    model.generate call.
+    
+    Args:
+        texts: Input natural language descriptions
+        tokenizer: Tokenizer instance
+        model: Model instance (or CTranslate2 translator)
+        device: Device to run inference on
+        max_input_length: Maximum input sequence length
+        max_new_tokens: Maximum number of generated tokens
+        num_beams: Number of beams for beam search (1 decodes greedily)
+        do_sample: Whether to use sampling
+        temperature: Temperature for sampling
+        encoder_cache: Optional cache of encoder outputs (see encode_cached;
+            Transformers models only)
+    
+    Returns:
+        List of parsed JSON dictionaries, in the same order as texts
+    """
+    if ctranslate2 is not None and isinstance(model, ctranslate2.Translator):
+        generated_texts = generate_texts_ct2(
+            texts, tokenizer, model, max_input_length, max_new_tokens,
+            num_beams, do_sample, temperature
+        )
+    else:
+        generated_texts = generate_texts_hf(
+            texts, tokenizer, model, device, max_input_length, max_new_tokens,
+            num_beams, do_sample, temperature, encoder_cache=encoder_cache
+        )
+    
+    return [parse_generated_json(generated_text) for generated_text in generated_texts]
+
+
+def generate_json_sorted_batches(
+    texts: List[str],
+    tokenizer,
+    model,
+    device: str,
+    batch_size: int = 8,
+    **generation_kwargs
+) -> List[Dict[str, Any]]:
+    """
+    Generate JSON for any number of texts, batching texts of similar length.
+    
+    Texts are sorted by token count before being split into batches, so each
+    batch pads to a length close to that of all its members. Results are
+    returned in the original input order.
+    
+    Args:
+        texts: Input natural language descriptions
+        tokenizer: Tokenizer instance
+        model: Model instance (or CTranslate2 translator)
+        device: Device to run inference on
+        batch_size: Number of texts per generate call
+        **generation_kwargs: Passed through to generate_json_batch
+    
+    Returns:
+        List of parsed JSON dictionaries, in the same order as texts
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+    if not texts:
+        # Fast tokenizers fail on an empty batch
+        return []
+    
+    lengths = [len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]]
+    order = sorted(range(len(texts)), key=lengths.__getitem__)
+    
+    results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+    for start in range(0, len(order), batch_size):
+        batch_indices = order[start:start + batch_size]
+        batch_results = generate_json_batch(
+            [texts[i] for i in batch_indices],
+            tokenizer,
+            model,
+            device,
+            **generation_kwargs
+        )
+        for i, result in zip(batch_indices, batch_results):
+            results[i] = result
+    
+    return results
+
+
+def generate_json(
+    text: str,
+    tokenizer,
+    model,
+    device: str,
+    max_input_length: int = 512,
+    max_new_tokens: int = 512,
+    num_beams: int = 1,
+    do_sample: bool = False,
+    temperature: float = 1.0,
+    encoder_cache: Optional[OrderedDict] = None
+) -> Dict[str, Any]:
+    """
+    Generate JSON from natural language text.
+    
+    Args:
+        text: Input natural language description
+        tokenizer: Tokenizer instance
+        model: Model instance (or CTranslate2 translator)
+        device: Device to run inference on
+        max_input_length: Maximum input sequence length
+        max_new_tokens: Maximum number of generated tokens
+        num_beams: Number of beams for beam search (1 decodes greedily)
+        do_sample: Whether to use sampling
+        temperature: Temperature for sampling
+        encoder_cache: Optional cache of encoder outputs (see encode_cached;
+            Transformers models only)
+    
+    Returns:
+        Parsed JSON dictionary
+    """
+    return generate_json_batch(
+        [text],
+        tokenizer,
+        model,
+        device,
+        max_input_length=max_input_length,
+        max_new_tokens=max_new_tokens,
+        num_beams=num_beams,
+        do_sample=do_sample,
+        temperature=temperature,
+        encoder_cache=encoder_cache
+    )[0]
+
+
 def pretty_print_json(data: Dict[str, Any]) -> None:
     """
     Pretty print JSON data.
@@ -161,7 +611,14 @@ def pretty_print_json(data: Dict[str, Any]) -> None:
 def run_inference(
     model_path: str,
     input_text: Optional[str] = None,
-    interactive: bool = True
+    interactive: bool = True,
+    input_file: Optional[str] = None,
+    batch_size: int = 8,
+    backend: str = "hf",
+    compile_encoder: bool = False,
+    quant: str = "none",
+    num_beams: int = 1,
+    max_new_tokens: int = 512
 ) -> None:
     """
     Run inference with the fine-tuned model.
@@ -170,13 +627,41 @@ def run_inference(
         model_path: Path to fine-tuned model directory
         input_text: Optional input text (if not provided, will prompt)
         interactive: Whether to run in interactive mode
+        input_file: Optional text file with one input per line (runs batch inference)
+        batch_size: Number of inputs per generate call in batch inference
+        backend: Generation backend ("hf", "ct2" or "ort")
+        compile_encoder: Whether to torch.compile the encoder (hf backend only)
+        quant: Weight quantization ("none", "int8" or "int4")
+        num_beams: Number of beams for beam search (1 decodes greedily)
+        max_new_tokens: Maximum number of generated tokens
     """
     # Load model
-    tokenizer, model, device = load_model(model_path)
+    tokenizer, model, device = load_model(
+        model_path, backend=backend, compile_encoder=compile_encoder, quant=quant
+    )
+    generation_kwargs = {"num_beams": num_beams, "max_new_tokens": max_new_tokens}
+    
+    if input_file:
+        # Batch inference over every non-empty line of the file
+        with open(input_file, 'r', encoding='utf-8') as f:
+            texts = [line.strip() for line in f if line.strip()]
+        
+        if not texts:
+            print(f"\nNo inputs found in {input_file}")
+            return
+        
+        print(f"\nRunning batch inference on {len(texts)} inputs (batch size {batch_size})...")
+        results = generate_json_sorted_batches(
+            texts, tokenizer, model, device, batch_size=batch_size, **generation_kwargs
+        )
+        for text, result in zip(texts, results):
+            print(f"\nInput: {text}")
+            pretty_print_json(result)
+        return
     
     if not interactive and input_text:
         # Single inference
-        result = generate_json(input_text, tokenizer, model, device)
+        result = generate_json(input_text, tokenizer, model, device, **generation_kwargs)
         pretty_print_json(result)
         return
     
@@ -187,6 +672,9 @@ def run_inference(
     print("Enter natural language descriptions to generate JSON.")
     print("Type 'quit' or 'exit' to stop.\n")
     
+    # Repeated inputs reuse their encoder output (hf backend only)
+    encoder_cache = OrderedDict() if backend == "hf" else None
+    
     while True:
         try:
             if input_text:
@@ -204,7 +692,9 @@ def run_inference(
             
             # Generate JSON
             print("\nGenerating JSON...")
-            result = generate_json(text, tokenizer, model, device)
+            result = generate_json(
+                text, tokenizer, model, device, encoder_cache=encoder_cache, **generation_kwargs
+            )
             
             # Pretty print
             pretty_print_json(result)
@@ -237,6 +727,50 @@ if __name__ == "__main__":
         default=None,
         help="Input text for single inference (if not provided, runs interactively)"
     )
+    parser.add_argument(
+        "--input_file",
+        type=str,
+        default=None,
+        help="Text file with one input per line for batch inference"
+    )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        default=8,
+        help="Batch size for batch inference (default: 8)"
+    )
+    parser.add_argument(
+        "--num_beams",
+        type=int,
+        default=1,
+        help="Number of beams for beam search (default: 1, greedy decoding)"
+    )
+    parser.add_argument(
+        "--max_new_tokens",
+        type=int,
+        default=512,
+        help="Maximum number of generated tokens (default: 512)"
+    )
+    parser.add_argument(
+        "--backend",
+        type=str,
+        choices=BACKENDS,
+        default="hf",
+        help="Generation backend: hf (Transformers), ct2 (CTranslate2) or ort (ONNX Runtime) (default: hf)"
+    )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        dest="compile_encoder",
+        help="Compile the encoder with torch.compile (hf backend only; first call is slow)"
+    )
+    parser.add_argument(
+        "--quant",
+        type=str,
+        choices=QUANT_MODES,
+        default="none",
+        help="Weight quantization: int8/int4 via bitsandbytes (hf, CUDA only) or int8 (ct2) (default: none)"
+    )
     parser.add_argument(
         "--interactive",
         action="store_true",
@@ -251,6 +785,8 @@ if __name__ == "__main__":
     )
     
     args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error("--batch_size must be at least 1")
     
     # Get absolute path
     project_root = Path(__file__).parent.parent
@@ -265,6 +801,13 @@ if __name__ == "__main__":
     run_inference(
         str(model_path),
         input_text=args.input_text,
-        interactive=args.interactive if args.input_text is None else False
+        interactive=args.interactive if args.input_text is None and args.input_file is None else False,
+        input_file=args.input_file,
+        batch_size=args.batch_size,
+        backend=args.backend,
+        compile_encoder=args.compile_encoder,
+        quant=args.quant,
+        num_beams=args.num_beams,
+        max_new_tokens=args.max_new_tokens
     )
 
@@ -5,9 +5,93 @@ This module generates 1-3 synthetic regulatory-style sentences per normalized ru
 for training a text-to-JSON model. All text avoids copyrighted ASHRAE content.
 """
 
+import itertools
 import json
+import multiprocessing
 import random
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any, Iterable, Iterator, Optional
+
+# orjson is optional; fall back to the stdlib encoder when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Sentence templates for performance rules, one tuple per requirement
+PERFORMANCE_U_VALUE_TEMPLATES = (
+    "In climate zone {cz}, {st} of type {ct} must not exceed a U-factor of {val}.",
+    "For {st} with {ct} construction in zone {cz}, the maximum U-value is {val}.",
+    "The baseline requirement for {st} ({ct}) in climate zone {cz} is U ≤ {val}.",
+    "In zone {cz}, {st} assemblies using {ct} construction shall have U-value no greater than {val}.",
+)
+PERFORMANCE_U_VALUE_CATEGORY_TEMPLATES = (
+    "For {bc} buildings in zone {cz}, {st} of type {ct} must have U-value ≤ {val}.",
+    "In climate zone {cz}, {bc} {st} with {ct} construction requires U ≤ {val}.",
+)
+PERFORMANCE_SHGC_TEMPLATES = (
+    "The baseline assembly requires SHGC ≤ {val} for {st}.",
+    "For {st}, the maximum solar heat gain coefficient is {val}.",
+    "The baseline SHGC limit for {st} is {val}.",
+)
+PERFORMANCE_SHGC_CLIMATE_ZONE_TEMPLATES = (
+    "In climate zone {cz}, {st} must have SHGC no greater than {val}.",
+    "Zone {cz} requires SHGC ≤ {val} for {st}.",
+)
+PERFORMANCE_F_FACTOR_TEMPLATES = (
+    "The F-factor for {st} must not exceed {val}.",
+    "For {st}, the maximum F-factor is {val}.",
+    "Baseline F-factor requirement for {st} is ≤ {val}.",
+)
+PERFORMANCE_C_FACTOR_TEMPLATES = (
+    "The C-factor for {st} shall be no greater than {val}.",
+    "For {st}, the maximum C-factor is {val}.",
+    "Baseline C-factor limit for {st} is {val}.",
+)
+PERFORMANCE_VT_TEMPLATES = (
+    "The minimum visible transmittance for {st} is {val}.",
+    "For {st}, VT must be at least {val}.",
+    "Baseline requires VT ≥ {val} for {st}.",
+)
+PERFORMANCE_U_VALUE_SHGC_TEMPLATES = (
+    "For {st}, the baseline requires U ≤ {u} and SHGC ≤ {s}.",
+    "The baseline assembly for {st} must meet U ≤ {u} and SHGC ≤ {s}.",
+)
+PERFORMANCE_CONSTRUCTION_NAME_TEMPLATES = (
+    "The {cn} assembly for {st} must have U-value ≤ {val}.",
+    "For {st}, use {cn} with maximum U-value of {val}.",
+)
+PERFORMANCE_GENERIC_TEMPLATES = (
+    "Baseline requirements apply to {st}.",
+    "The baseline standard specifies requirements for {st}.",
+)
+
+# Sentence templates for assignment rules
+ASSIGNMENT_BASIC_TEMPLATES = (
+    "For {st} surfaces, use {ct} construction.",
+    "The baseline requires {ct} construction for {st}.",
+    "Use {ct} for {st} in the baseline model.",
+    "{st} shall use {ct} construction type.",
+)
+ASSIGNMENT_BUILDING_TYPE_TEMPLATES = (
+    "For {bt} buildings, use {ct} for {st} surfaces.",
+    "In {bt} buildings, {st} requires {ct} construction.",
+    "The baseline for {bt} specifies {ct} for {st}.",
+    "{bt} buildings shall use {ct} construction for {st}.",
+)
+ASSIGNMENT_SPACE_TYPE_TEMPLATES = (
+    "For {sp} spaces, use {ct} for {st}.",
+    "In {sp} spaces, {st} shall be {ct} construction.",
+    "The baseline for {sp} requires {ct} for {st}.",
+)
+ASSIGNMENT_BUILDING_CATEGORY_TEMPLATES = (
+    "For {bc} buildings, {st} must use {ct} construction.",
+    "In {bc} buildings, use {ct} for {st}.",
+    "The baseline for {bc} buildings specifies {ct} for {st}.",
+)
+ASSIGNMENT_BUILDING_SPACE_TEMPLATES = (
+    "For {bt} buildings with {sp} spaces, use {ct} for {st}.",
+    "In {bt} buildings, {sp} spaces require {ct} construction for {st}.",
+)
 
 
 def format_value(value: Any) -> str:
@@ -44,15 +128,8 @@ def generate_performance_texts(rule: Dict[str, Any]) -> List[str]:
     
     # Template 1: U-value requirement
     if max_u_value is not None:
-        templates = [
-            "In climate zone {cz}, {st} of type {ct} must not exceed a U-factor of {val}.",
-            "For {st} with {ct} construction in zone {cz}, the maximum U-value is {val}.",
-            "The baseline requirement for {st} ({ct}) in climate zone {cz} is U ≤ {val}.",
-            "In zone {cz}, {st} assemblies using {ct} construction shall have U-value no greater than {val}.",
-        ]
-        
         if climate_zone and surface_type and construction_type:
-            template = random.choice(templates)
+            template = random.choice(PERFORMANCE_U_VALUE_TEMPLATES)
             text = template.format(
                 cz=climate_zone,
                 st=surface_type,
@@ -63,11 +140,7 @@ def generate_performance_texts(rule: Dict[str, Any]) -> List[str]:
         
         # Variation with building category
         if building_category and climate_zone and surface_type and construction_type:
-            templates_cat = [
-                "For {bc} buildings in zone {cz}, {st} of type {ct} must have U-value ≤ {val}.",
-                "In climate zone {cz}, {bc} {st} with {ct} construction requires U ≤ {val}.",
-            ]
-            template = random.choice(templates_cat)
+            template = random.choice(PERFORMANCE_U_VALUE_CATEGORY_TEMPLATES)
             text = template.format(
                 bc=building_category,
                 cz=climate_zone,
@@ -79,12 +152,7 @@ def generate_performance_texts(rule: Dict[str, Any]) -> List[str]:
     
     # Template 2: SHGC requirement
     if max_shgc is not None and surface_type:
-        templates = [
-            "The baseline assembly requires SHGC ≤ {val} for {st}.",
-            "For {st}, the maximum solar heat gain coefficient is {val}.",
-            "The baseline SHGC limit for {st} is {val}.",
-        ]
-        template = random.choice(templates)
+        template = random.choice(PERFORMANCE_SHGC_TEMPLATES)
         text = template.format(
             st=surface_type,
             val=max_shgc
@@ -93,11 +161,7 @@ def generate_performance_texts(rule: Dict[str, Any]) -> List[str]:
         
         # With climate zone
         if climate_zone:
-            templates_cz = [
-                "In climate zone {cz}, {st} must have SHGC no greater than {val}.",
-                "Zone {cz} requires SHGC ≤ {val} for {st}.",
-            ]
-            template = random.choice(templates_cz)
+            template = random.choice(PERFORMANCE_SHGC_CLIMATE_ZONE_TEMPLATES)
             text = template.format(
                 cz=climate_zone,
                 st=surface_type,
@@ -107,12 +171,7 @@ def generate_performance_texts(rule: Dict[str, Any]) -> List[str]:
     
     # Template 3: F-factor requirement
     if max_f_factor is not None and surface_type:
-        templates = [
-            "The F-factor for {st} must not exceed {val}.",
-            "For {st}, the maximum F-factor is {val}.",
-            "Baseline F-factor requirement for {st} is ≤ {val}.",
-        ]
-        template = random.choice(templates)
+        template = random.choice(PERFORMANCE_F_FACTOR_TEMPLATES)
         text = template.format(
             st=surface_type,
             val=max_f_factor
@@ -121,12 +180,7 @@ def generate_performance_texts(rule: Dict[str, Any]) -> List[str]:
     
     # Template 4: C-factor requirement
     if max_c_factor is not None and surface_type:
-        templates = [
-            "The C-factor for {st} shall be no greater than {val}.",
-            "For {st}, the maximum C-factor is {val}.",
-            "Baseline C-factor limit for {st} is {val}.",
-        ]
-        template = random.choice(templates)
+        template = random.choice(PERFORMANCE_C_FACTOR_TEMPLATES)
         text = template.format(
             st=surface_type,
             val=max_c_factor
@@ -135,12 +189,7 @@ def generate_performance_texts(rule: Dict[str, Any]) -> List[str]:
     
     # Template 5: Visible transmittance requirement
     if min_vt is not None and surface_type:
-        templates = [
-            "The minimum visible transmittance for {st} is {val}.",
-            "For {st}, VT must be at least {val}.",
-            "Baseline requires VT ≥ {val} for {st}.",
-        ]
-        template = random.choice(templates)
+        template = random.choice(PERFORMANCE_VT_TEMPLATES)
         text = template.format(
             st=surface_type,
             val=min_vt
@@ -149,11 +198,7 @@ def generate_performance_texts(rule: Dict[str, Any]) -> List[str]:
     
     # Template 6: Combined requirements
     if max_u_value is not None and max_shgc is not None and surface_type:
-        templates = [
-            "For {st}, the baseline requires U ≤ {u} and SHGC ≤ {s}.",
-            "The baseline assembly for {st} must meet U ≤ {u} and SHGC ≤ {s}.",
-        ]
-        template = random.choice(templates)
+        template = random.choice(PERFORMANCE_U_VALUE_SHGC_TEMPLATES)
         text = template.format(
             st=surface_type,
             u=max_u_value,
@@ -163,11 +208,7 @@ def generate_performance_texts(rule: Dict[str, Any]) -> List[str]:
     
     # Template 7: Construction name reference
     if construction_name and max_u_value is not None and surface_type:
-        templates = [
-            "The {cn} assembly for {st} must have U-value ≤ {val}.",
-            "For {st}, use {cn} with maximum U-value of {val}.",
-        ]
-        template = random.choice(templates)
+        template = random.choice(PERFORMANCE_CONSTRUCTION_NAME_TEMPLATES)
         text = template.format(
             cn=construction_name,
             st=surface_type,
@@ -177,11 +218,7 @@ def generate_performance_texts(rule: Dict[str, Any]) -> List[str]:
     
     # If no specific requirements, create a generic rule
     if not texts and surface_type:
-        templates = [
-            "Baseline requirements apply to {st}.",
-            "The baseline standard specifies requirements for {st}.",
-        ]
-        template = random.choice(templates)
+        template = random.choice(PERFORMANCE_GENERIC_TEMPLATES)
         text = template.format(st=surface_type)
         texts.append(text)
     
@@ -214,13 +251,7 @@ def generate_assignment_texts(rule: Dict[str, Any]) -> List[str]:
     
     # Template 1: Basic assignment
     if assigned_construction_type and surface_type:
-        templates = [
-            "For {st} surfaces, use {ct} construction.",
-            "The baseline requires {ct} construction for {st}.",
-            "Use {ct} for {st} in the baseline model.",
-            "{st} shall use {ct} construction type.",
-        ]
-        template = random.choice(templates)
+        template = random.choice(ASSIGNMENT_BASIC_TEMPLATES)
         text = template.format(
             st=surface_type,
             ct=assigned_construction_type
@@ -229,13 +260,7 @@ def generate_assignment_texts(rule: Dict[str, Any]) -> List[str]:
     
     # Template 2: With building type
     if building_type and assigned_construction_type and surface_type:
-        templates = [
-            "For {bt} buildings, use {ct} for {st} surfaces.",
-            "In {bt} buildings, {st} requires {ct} construction.",
-            "The baseline for {bt} specifies {ct} for {st}.",
-            "{bt} buildings shall use {ct} construction for {st}.",
-        ]
-        template = random.choice(templates)
+        template = random.choice(ASSIGNMENT_BUILDING_TYPE_TEMPLATES)
         text = template.format(
             bt=building_type,
             ct=assigned_construction_type,
@@ -245,12 +270,7 @@ def generate_assignment_texts(rule: Dict[str, Any]) -> List[str]:
     
     # Template 3: With space type
     if space_type and assigned_construction_type and surface_type:
-        templates = [
-            "For {sp} spaces, use {ct} for {st}.",
-            "In {sp} spaces, {st} shall be {ct} construction.",
-            "The baseline for {sp} requires {ct} for {st}.",
-        ]
-        template = random.choice(templates)
+        template = random.choice(ASSIGNMENT_SPACE_TYPE_TEMPLATES)
         text = template.format(
             sp=space_type,
             ct=assigned_construction_type,
@@ -260,12 +280,7 @@ def generate_assignment_texts(rule: Dict[str, Any]) -> List[str]:
     
     # Template 4: With building category
     if building_category and assigned_construction_type and surface_type:
-        templates = [
-            "For {bc} buildings, {st} must use {ct} construction.",
-            "In {bc} buildings, use {ct} for {st}.",
-            "The baseline for {bc} buildings specifies {ct} for {st}.",
-        ]
-        template = random.choice(templates)
+        template = random.choice(ASSIGNMENT_BUILDING_CATEGORY_TEMPLATES)
         text = template.format(
             bc=building_category,
             ct=assigned_construction_type,
@@ -275,11 +290,7 @@ def generate_assignment_texts(rule: Dict[str, Any]) -> List[str]:
     
     # Template 5: Combined building type and space type
     if building_type and space_type and assigned_construction_type and surface_type:
-        templates = [
-            "For {bt} buildings with {sp} spaces, use {ct} for {st}.",
-            "In {bt} buildings, {sp} spaces require {ct} construction for {st}.",
-        ]
-        template = random.choice(templates)
+        template = random.choice(ASSIGNMENT_BUILDING_SPACE_TEMPLATES)
         text = template.format(
             bt=building_type,
             sp=space_type,
@@ -302,6 +313,13 @@ def generate_assignment_texts(rule: Dict[str, Any]) -> List[str]:
         return texts
 
 
+def dumps_compact_json(data: Dict[str, Any]) -> str:
+    """Serialize data as compact JSON (no whitespace, non-ASCII kept as is)."""
+    if orjson is not None:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+
 def generate_texts_for_rule(rule: Dict[str, Any]) -> List[Tuple[str, str]]:
     """
     Generate 1-3 synthetic text-JSON pairs for a single rule.
@@ -313,7 +331,7 @@ def generate_texts_for_rule(rule: Dict[str, Any]) -> List[Tuple[str, str]]:
         List of tuples (input_text, target_json_string)
     """
     rule_category = rule.get("rule_category")
-    target_json = json.dumps(rule, separators=(',', ':'))  # Compact JSON
+    target_json = dumps_compact_json(rule)
     
     if rule_category == "performance":
         texts = generate_performance_texts(rule)
@@ -327,26 +345,70 @@ def generate_texts_for_rule(rule: Dict[str, Any]) -> List[Tuple[str, str]]:
     return [(text, target_json) for text in texts]
 
 
-def generate_texts_for_rules(rules: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+def generate_texts_for_rule_or_warn(rule: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Like generate_texts_for_rule, but prints a warning and returns no pairs on failure."""
+    try:
+        return generate_texts_for_rule(rule)
+    except Exception as e:
+        print(f"Warning: Failed to generate text for rule {rule.get('rule_id', 'unknown')}: {e}")
+        return []
+
+
+def iter_texts_for_rules(
+    rules: Iterable[Dict[str, Any]],
+    num_workers: int = 1,
+    chunksize: int = 64
+) -> Iterator[Tuple[Dict[str, Any], List[Tuple[str, str]]]]:
+    """
+    Yield each rule with its synthetic text-JSON pairs, in rule order.
+    
+    Rules that fail to generate are reported with a warning and yielded with
+    no pairs. With num_workers > 1 the rules are read in batches of
+    num_workers * chunksize and each batch is split across a multiprocessing
+    pool; template choices then no longer follow random.seed in the parent
+    process. For small rule sets the pool startup costs more than it saves.
+    
+    Args:
+        rules: Iterable of normalized rule dictionaries
+        num_workers: Number of worker processes (1 runs serially)
+        chunksize: Number of rules sent to a worker at a time
+    
+    Yields:
+        Tuples (rule, [(input_text, target_json_string), ...])
+    """
+    if num_workers <= 1:
+        for rule in rules:
+            yield rule, generate_texts_for_rule_or_warn(rule)
+        return
+    
+    rules = iter(rules)
+    with multiprocessing.Pool(num_workers) as pool:
+        while True:
+            batch = list(itertools.islice(rules, num_workers * chunksize))
+            if not batch:
+                break
+            yield from zip(batch, pool.map(generate_texts_for_rule_or_warn, batch, chunksize=chunksize))
+
+
+def generate_texts_for_rules(
+    rules: List[Dict[str, Any]],
+    num_workers: int = 1,
+    chunksize: int = 64
+) -> List[Tuple[str, str]]:
     """
     Generate synthetic text-JSON pairs for a list of rules.
     
     Args:
         rules: List of normalized rule dictionaries
+        num_workers: Number of worker processes (see iter_texts_for_rules)
+        chunksize: Number of rules sent to a worker at a time
     
     Returns:
         List of tuples (input_text, target_json_string)
     """
     all_pairs = []
-    
-    for rule in rules:
-        try:
-            pairs = generate_texts_for_rule(rule)
-            all_pairs.extend(pairs)
-        except Exception as e:
-            print(f"Warning: Failed to generate text for rule {rule.get('rule_id', 'unknown')}: {e}")
-            continue
-    
+    for _, pairs in iter_texts_for_rules(rules, num_workers=num_workers, chunksize=chunksize):
+        all_pairs.extend(pairs)
     return all_pairs
 
 
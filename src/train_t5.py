@@ -5,10 +5,9 @@ Fine-tunes a FLAN-T5 or T5-base model for text-to-JSON generation
 using the construction rules dataset.
 """
 
-import json
 import os
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Optional
 import torch
 from transformers import (
     AutoTokenizer,
@@ -17,19 +16,10 @@ from transformers import (
     Seq2SeqTrainer,
     DataCollatorForSeq2Seq
 )
-from datasets import Dataset
+from datasets import load_dataset
 import numpy as np
 
 
-def load_jsonl_dataset(file_path: str) -> List[Dict[str, Any]]:
-    """Load a JSONL dataset file."""
-    data = []
-    with open(file_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            data.append(json.loads(line.strip()))
-    return data
-
-
 def compute_metrics(eval_pred):
     """
     Compute custom metrics: exact match and JSON validity rate.
@@ -50,7 +40,13 @@ def compute_metrics(eval_pred):
     }
 
 
-def prepare_dataset(jsonl_path: str, tokenizer, max_input_length: int = 512, max_target_length: int = 512):
+def prepare_dataset(
+    jsonl_path: str,
+    tokenizer,
+    max_input_length: int = 512,
+    max_target_length: int = 512,
+    num_proc: Optional[int] = None
+):
     """
     Prepare the dataset for training.
 
@@ -59,21 +55,11 @@ def prepare_dataset(jsonl_path: str, tokenizer, max_input_length: int = 512, max
         tokenizer: Tokenizer instance
         max_input_length: Maximum input sequence length
         max_target_length: Maximum target sequence length
+        num_proc: Number of processes used for tokenization (None tokenizes
+            in the main process)
     """
-    # Load data
-    data = load_jsonl_dataset(jsonl_path)
-
-    # Prepare inputs and targets
-    inputs = [item["input_text"] for item in data]
-    targets = [item["target_json"] for item in data]
-
-    # Create dataset from raw data
-    dataset_dict = {
-        "input_text": inputs,
-        "target_json": targets
-    }
-
-    dataset = Dataset.from_dict(dataset_dict)
+    # Load data into an Arrow-backed (memory-mapped) dataset
+    dataset = load_dataset("json", data_files=jsonl_path, split="train")
 
     # Define tokenization function
     def tokenize_function(examples):
@@ -94,13 +80,18 @@ def prepare_dataset(jsonl_path: str, tokenizer, max_input_length: int = 512, max
         )
 
         model_inputs["labels"] = labels["input_ids"]
+        # Used by group_by_length to batch examples of similar length
+        model_inputs["input_length"] = [len(ids) for ids in model_inputs["input_ids"]]
 
         return model_inputs
 
-    # Apply tokenization
+    # Apply tokenization in large batches so the fast tokenizer encodes
+    # many examples per call
     tokenized_dataset = dataset.map(
         tokenize_function,
         batched=True,
+        batch_size=1000,
+        num_proc=num_proc,
         remove_columns=dataset.column_names
     )
 
@@ -117,7 +108,9 @@ def train_model(
     weight_decay: float = 0.01,
     max_input_length: int = 512,
     max_target_length: int = 512,
-    eval_split: float = 0.1
+    eval_split: float = 0.1,
+    num_proc: Optional[int] = None,
+    gradient_checkpointing: bool = False
 ):
     """
     Train a T5/FLAN-T5 model for text-to-JSON generation.
@@ -133,6 +126,9 @@ def train_model(
         max_input_length: Maximum input sequence length
         max_target_length: Maximum target sequence length
         eval_split: Fraction of data to use for evaluation
+        num_proc: Number of processes used for dataset tokenization
+        gradient_checkpointing: Recompute activations in the backward pass
+            to save memory (allows larger batch sizes at some compute cost)
     """
     print("="*80)
     print("FINE-TUNING T5/FLAN-T5 MODEL")
@@ -146,10 +142,15 @@ def train_model(
     print(f"\nLoading model: {model_name}")
     tokenizer = AutoTokenizer.from_pretrained(model_name)
     model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+    if gradient_checkpointing:
+        # The KV cache is incompatible with recomputing activations
+        model.config.use_cache = False
     
     # Prepare dataset
     print(f"\nLoading dataset from {dataset_path}")
-    dataset = prepare_dataset(dataset_path, tokenizer, max_input_length, max_target_length)
+    dataset = prepare_dataset(
+        dataset_path, tokenizer, max_input_length, max_target_length, num_proc=num_proc
+    )
     
     # Split into train and eval
     if eval_split > 0:
@@ -162,11 +163,14 @@ def train_model(
         train_dataset = dataset
         eval_dataset = None
     
-    # Data collator
+    # Data collator: pad each batch to its longest sequence, rounded up to a
+    # multiple of 8 so FP16/BF16 matmuls can use Tensor Cores
     data_collator = DataCollatorForSeq2Seq(
         tokenizer=tokenizer,
         model=model,
-        padding=True
+        padding="longest",
+        pad_to_multiple_of=8,
+        label_pad_token_id=-100
     )
     
     # Calculate reasonable eval/save steps
@@ -175,6 +179,11 @@ def train_model(
     steps_per_epoch = len(train_dataset) // batch_size
     eval_save_steps = max(50, steps_per_epoch // 3)  # Eval 3 times per epoch, minimum 50 steps
 
+    # Mixed precision: BF16 on GPUs with native support (compute capability
+    # 8.0+, Ampere and newer), FP16 on older GPUs where BF16 is only emulated
+    use_bf16 = torch.cuda.is_available() and torch.cuda.get_device_capability()[0] >= 8
+    use_fp16 = torch.cuda.is_available() and not use_bf16
+
     # Training arguments
     training_args = Seq2SeqTrainingArguments(
         output_dir=output_dir,
@@ -195,7 +204,12 @@ def train_model(
         push_to_hub=False,
         report_to="none",
         predict_with_generate=False,  # Set to True if you want to see generated text during eval
-        fp16=torch.cuda.is_available(),  # Enable mixed precision training on GPU
+        bf16=use_bf16,
+        fp16=use_fp16,
+        gradient_checkpointing=gradient_checkpointing,
+        gradient_checkpointing_kwargs={"use_reentrant": False},
+        group_by_length=True,  # Batch similar lengths together to minimize padding
+        length_column_name="input_length",
     )
     
     # Trainer
@@ -273,6 +287,17 @@ if __name__ == "__main__":
         default=0.01,
         help="Weight decay (default: 0.01)"
     )
+    parser.add_argument(
+        "--num_proc",
+        type=int,
+        default=None,
+        help="Number of processes for dataset tokenization (default: main process only)"
+    )
+    parser.add_argument(
+        "--gradient_checkpointing",
+        action="store_true",
+        help="Enable gradient checkpointing to reduce activation memory"
+    )
     
     args = parser.parse_args()
     
@@ -292,6 +317,8 @@ if __name__ == "__main__":
         learning_rate=args.learning_rate,
         batch_size=args.batch_size,
         num_epochs=args.num_epochs,
-        weight_decay=args.weight_decay
+        weight_decay=args.weight_decay,
+        num_proc=args.num_proc,
+        gradient_checkpointing=args.gradient_checkpointing
     )
 